@@ -38,6 +38,13 @@ def run_migrations() -> None:
     pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
     with engine.connect() as connection:
+        is_sqlite = connection.dialect.name == "sqlite"
+        if is_sqlite:
+            # batch migrations recreate tables on sqlite. With foreign keys enabled,
+            # dropping the old table would cascade and delete all referencing rows
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
@@ -47,5 +54,10 @@ def run_migrations() -> None:
         with context.begin_transaction():
             context.run_migrations()
 
+        if is_sqlite:
+            # the connection goes back into the pool
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+            connection.commit()
+
 
 run_migrations()
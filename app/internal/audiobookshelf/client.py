@@ -11,6 +11,10 @@ from sqlmodel import Session
 from app.internal.audiobookshelf.config import abs_config
 from app.internal.models import BookRequest
 from app.util.log import logger
+from app.util.wishlist_cache import flush_wishlist_counts
+
+# searches running at the same time when checking many books against ABS
+_ABS_CHECK_CONCURRENCY = 10
 
 
 def _headers(session: Session) -> dict[str, str]:
@@ -241,15 +245,21 @@ async def abs_mark_downloaded_flags(
     to_check = [b for b in books if not b.downloaded]
     # Limit to avoid flooding ABS
     to_check = to_check[:25]
+    semaphore = asyncio.Semaphore(_ABS_CHECK_CONCURRENCY)
 
-    async def _check_and_mark(b: BookRequest):
-        try:
-            exists = await abs_book_exists(session, client_session, b)
-            if exists:
-                b.downloaded = True
-                session.add(b)
-        except Exception as e:
-            logger.debug("ABS: failed exist check", asin=b.asin, error=str(e))
+    async def _check_and_mark(b: BookRequest) -> bool:
+        async with semaphore:
+            try:
+                exists = await abs_book_exists(session, client_session, b)
+                if exists:
+                    b.downloaded = True
+                    session.add(b)
+                    return True
+            except Exception as e:
+                logger.debug("ABS: failed exist check", asin=b.asin, error=str(e))
+            return False
 
-    await asyncio.gather(*[_check_and_mark(b) for b in to_check])
+    marked = await asyncio.gather(*[_check_and_mark(b) for b in to_check])
     session.commit()
+    if any(marked):
+        flush_wishlist_counts()
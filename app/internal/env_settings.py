@@ -10,6 +10,8 @@ from app.internal.auth.login_types import LoginTypeEnum
 class DBSettings(BaseModel):
     sqlite_path: str = "db.sqlite"
     """Relative path to the sqlite database given the config directory. If absolute, it ignores the config dir location."""
+    sqlite_wal: bool = False
+    """Use write-ahead logging for the sqlite database. Does not work on network filesystems."""
     use_postgres: bool = False
     postgres_host: str = "localhost"
     postgres_port: int = 5432
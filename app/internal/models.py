@@ -6,7 +6,16 @@ from enum import Enum
 from typing import Annotated, Literal, Optional, Union
 
 import pydantic
-from sqlmodel import JSON, Column, DateTime, Field, SQLModel, UniqueConstraint, func
+from sqlmodel import (
+    JSON,
+    Column,
+    DateTime,
+    Field,
+    Index,
+    SQLModel,
+    UniqueConstraint,
+    func,
+)
 
 
 class BaseModel(SQLModel):
@@ -89,6 +98,12 @@ class BookWishlistResult(BaseBook):
         return len(self.requested_by)
 
 
+class WishlistCounts(pydantic.BaseModel):
+    requests: int
+    downloaded: int
+    manual: int
+
+
 class BookRequest(BaseBook, table=True):
     """
     A book request is not directly a book that has been requested. At first, it is simply a cache so that we don't
@@ -112,6 +127,8 @@ class BookRequest(BaseBook, table=True):
 
     __table_args__ = (
         UniqueConstraint("asin", "user_username", name="unique_asin_user"),
+        # covers the wishlist count and book queries
+        Index("ix_br_dl_asin_user", "downloaded", "asin", "user_username"),
     )
 
     class Config:  # pyright: ignore[reportIncompatibleVariableOverride]
@@ -138,6 +155,8 @@ class ManualBookRequest(BaseModel, table=True):
     )
     downloaded: bool = False
 
+    __table_args__ = (Index("ix_mbr_user_dl", "user_username", "downloaded"),)
+
     class Config:  # pyright: ignore[reportIncompatibleVariableOverride]
         arbitrary_types_allowed = True
 
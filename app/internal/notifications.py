@@ -1,5 +1,6 @@
+import asyncio
 import json
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 from aiohttp import ClientSession, InvalidUrlClientError
 from sqlmodel import Session, select
@@ -216,3 +217,33 @@ async def send_all_manual_notifications(
                 requester=user,
                 other_replacements=other_replacements,
             )
+
+
+# Notifications are sent by a long running worker instead of the request that triggered
+# them, so a slow notification endpoint doesn't hold up the response or other requests.
+_notification_queue: asyncio.Queue[Callable[[], Awaitable[object]]] = asyncio.Queue(
+    maxsize=1000
+)
+
+
+def queue_notifications(send: Callable[[], Awaitable[object]]):
+    """
+    Queues a call like `partial(send_all_notifications, ...)` to be run by the
+    notification worker.
+    """
+    try:
+        _notification_queue.put_nowait(send)
+    except asyncio.QueueFull:
+        logger.warning("Notification queue is full, dropping notification")
+
+
+async def notification_worker():
+    while True:
+        send = await _notification_queue.get()
+        try:
+            await send()
+        except Exception as e:
+            # already logged when sending
+            logger.debug("Queued notification failed", error=str(e))
+        finally:
+            _notification_queue.task_done()
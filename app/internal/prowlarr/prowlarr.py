@@ -38,24 +38,39 @@ ProwlarrConfigKey = Literal[
 ]
 
 
+# A valid configuration is remembered for a short while so the checks don't query the
+# config on every source lookup. Changing the url or api key flushes it.
+_VALID_CONFIG_TTL = 30
+_valid_config_cache = SimpleCache[bool]()
+
+
 class ProwlarrConfig(StringConfigCache[ProwlarrConfigKey]):
     def raise_if_invalid(self, session: Session):
+        if _valid_config_cache.get(_VALID_CONFIG_TTL):
+            return
         if not self.get_base_url(session):
             raise ProwlarrMisconfigured("Prowlarr base url not set")
         if not self.get_api_key(session):
             raise ProwlarrMisconfigured("Prowlarr base url not set")
+        _valid_config_cache.set(True)
 
     def is_valid(self, session: Session) -> bool:
-        return (
+        if _valid_config_cache.get(_VALID_CONFIG_TTL):
+            return True
+        valid = (
             self.get_base_url(session) is not None
             and self.get_api_key(session) is not None
         )
+        if valid:
+            _valid_config_cache.set(True)
+        return valid
 
     def get_api_key(self, session: Session) -> Optional[str]:
         return self.get(session, "prowlarr_api_key")
 
     def set_api_key(self, session: Session, api_key: str):
         self.set(session, "prowlarr_api_key", api_key)
+        _valid_config_cache.flush()
 
     def get_base_url(self, session: Session) -> Optional[str]:
         path = self.get(session, "prowlarr_base_url")
@@ -65,6 +80,7 @@ class ProwlarrConfig(StringConfigCache[ProwlarrConfigKey]):
 
     def set_base_url(self, session: Session, base_url: str):
         self.set(session, "prowlarr_base_url", base_url)
+        _valid_config_cache.flush()
 
     def get_source_ttl(self, session: Session) -> int:
         return self.get_int(session, "prowlarr_source_ttl", 24 * 60 * 60)
@@ -96,10 +112,17 @@ prowlarr_source_cache = SimpleCache[list[ProwlarrSource], str]()
 prowlarr_indexer_cache = SimpleCache[Indexer, str]()
 
 
-def flush_prowlarr_cache():
-    logger.info("Flushing prowlarr caches")
+def flush_prowlarr_cache(sources_only: bool = False):
+    """
+    Flushes the cached sources and indexers. If only the search parameters changed
+    (categories, selected indexers), `sources_only` keeps the fetched indexer list.
+    """
+    logger.info("Flushing prowlarr caches", sources_only=sources_only)
     prowlarr_source_cache.flush()
+    if sources_only:
+        return
     prowlarr_indexer_cache.flush()
+    prowlarr_indexer_response_cache.flush()
 
 
 async def _get_torrent_info_hash(
@@ -315,13 +338,18 @@ class IndexerResponse(BaseModel):
         return self.state == "ok"
 
 
+# Short lived cache of the complete response (including failures) to avoid hitting
+# Prowlarr on every settings page load.
+prowlarr_indexer_response_cache = SimpleCache[IndexerResponse, str, str]()
+_INDEXER_RESPONSE_TTL = 30
+
+
 async def get_indexers(
     session: Session, client_session: ClientSession
 ) -> IndexerResponse:
     """Fetch the list of all indexers from Prowlarr."""
     base_url = prowlarr_config.get_base_url(session)
     api_key = prowlarr_config.get_api_key(session)
-    source_ttl = prowlarr_config.get_source_ttl(session)
 
     if not base_url or not api_key:
         logger.warning("Prowlarr base url or api key not set, skipping indexer fetch")
@@ -330,6 +358,20 @@ async def get_indexers(
             error="Missing Prowlarr base url or api key",
         )
 
+    if cached := prowlarr_indexer_response_cache.get(
+        _INDEXER_RESPONSE_TTL, base_url, api_key
+    ):
+        return cached
+
+    response = await _fetch_indexers(session, client_session, base_url, api_key)
+    prowlarr_indexer_response_cache.set(response, base_url, api_key)
+    return response
+
+
+async def _fetch_indexers(
+    session: Session, client_session: ClientSession, base_url: str, api_key: str
+) -> IndexerResponse:
+    source_ttl = prowlarr_config.get_source_ttl(session)
     indexers = list(prowlarr_indexer_cache.get_all(source_ttl).values())
     try:
         if len(indexers) > 0:
@@ -16,6 +16,7 @@ from app.internal.prowlarr.prowlarr import (
 from app.internal.ranking.download_ranking import rank_sources
 from app.internal.audiobookshelf.config import abs_config
 from app.internal.audiobookshelf.client import abs_trigger_scan
+from app.util.wishlist_cache import flush_wishlist_counts
 
 querying: set[str] = set()
 
@@ -101,6 +102,7 @@ async def query_sources(
                     b.downloaded = True
                     session.add(b)
                 session.commit()
+                flush_wishlist_counts()
                 # Try to trigger an ABS scan to pick up new media
                 try:
                     if abs_config.is_valid(session):
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Any
 from urllib.parse import quote_plus, urlencode
 
@@ -17,6 +19,7 @@ from app.internal.auth.session_middleware import (
 from app.internal.book_search import clear_old_book_caches
 from app.internal.env_settings import Settings
 from app.internal.models import User
+from app.internal.notifications import notification_worker
 from app.routers import api, auth, root, search, settings, wishlist
 from app.util.db import open_session
 from app.util.fetch_js import fetch_scripts
@@ -33,6 +36,13 @@ with open_session() as session:
     clear_old_book_caches(session)
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    worker = asyncio.create_task(notification_worker())
+    yield
+    worker.cancel()
+
+
 app = FastAPI(
     title="AudioBookRequest",
     debug=Settings().app.debug,
@@ -44,6 +54,7 @@ app = FastAPI(
     ],
     root_path=Settings().app.base_url.rstrip("/"),
     redirect_slashes=False,
+    lifespan=lifespan,
 )
 
 app.include_router(auth.router, include_in_schema=False)
@@ -12,6 +12,7 @@ from app.internal.auth.authentication import (
 )
 from app.internal.models import GroupEnum, User
 from app.util.db import get_session
+from app.util.wishlist_cache import flush_wishlist_counts
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -237,3 +238,4 @@ def delete_user(
 
     session.delete(user)
     session.commit()
+    flush_wishlist_counts()
@@ -36,6 +36,7 @@ from app.internal.audiobookshelf.client import abs_list_library_items
 from app.util.templates import template_response, templates
 from app.internal.book_search import list_audible_books, get_region_from_settings
 from app.internal.ai.client import clear_ai_cache_for_user
+from app.util.wishlist_cache import flush_wishlist_counts
 
 router = APIRouter()
 
@@ -728,6 +729,7 @@ def populate_sample_data(
                 created_count += 1
     
     session.commit()
+    flush_wishlist_counts()
     
     logger.info(f"Created {created_count} sample book entries for testing")
     
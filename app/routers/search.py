@@ -1,4 +1,5 @@
 import uuid
+from functools import partial
 from typing import Annotated, Optional
 
 from aiohttp import ClientSession
@@ -34,6 +35,7 @@ from app.internal.models import (
     User,
 )
 from app.internal.notifications import (
+    queue_notifications,
     send_all_manual_notifications,
     send_all_notifications,
 )
@@ -45,6 +47,7 @@ from app.util.connection import get_connection
 from app.util.db import get_session, open_session
 from app.util.recommendations import get_homepage_recommendations
 from app.util.templates import template_response
+from app.util.wishlist_cache import flush_wishlist_counts
 
 router = APIRouter(prefix="/search")
 
@@ -181,15 +184,18 @@ async def add_request(
     try:
         session.add(book)
         session.commit()
+        flush_wishlist_counts()
     except IntegrityError:
         session.rollback()
         pass  # ignore if already exists
 
-    background_task.add_task(
-        send_all_notifications,
-        event_type=EventEnum.on_new_request,
-        requester=User.model_validate(user),
-        book_asin=asin,
+    queue_notifications(
+        partial(
+            send_all_notifications,
+            event_type=EventEnum.on_new_request,
+            requester=User.model_validate(user),
+            book_asin=asin,
+        )
     )
 
     if quality_config.get_auto_download(session) and user.is_above(GroupEnum.trusted):
@@ -269,6 +275,7 @@ async def delete_request(
     if books:
         [session.delete(b) for b in books]
         session.commit()
+        flush_wishlist_counts()
 
     books = get_wishlist_books(
         session, None, "downloaded" if downloaded else "not_downloaded"
@@ -310,7 +317,6 @@ async def read_manual(
 async def add_manual(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
-    background_task: BackgroundTasks,
     title: Annotated[str, Form()],
     author: Annotated[str, Form()],
     narrator: Annotated[Optional[str], Form()] = None,
@@ -342,11 +348,14 @@ async def add_manual(
         )
     session.add(book_request)
     session.commit()
+    flush_wishlist_counts()
 
-    background_task.add_task(
-        send_all_manual_notifications,
-        event_type=EventEnum.on_new_request,
-        book_request=ManualBookRequest.model_validate(book_request),
+    queue_notifications(
+        partial(
+            send_all_manual_notifications,
+            event_type=EventEnum.on_new_request,
+            book_request=ManualBookRequest.model_validate(book_request),
+        )
     )
 
     auto_download = quality_config.get_auto_download(session)
@@ -1,7 +1,10 @@
-from typing import Annotated, Any, Optional
+import json
+from types import MappingProxyType
+from typing import Annotated, Any, Mapping, Optional
 
 from aiohttp import ClientSession
 from fastapi import APIRouter, Depends, Form, Request, Response, Security
+from markupsafe import Markup
 from sqlmodel import Session
 
 from app.internal.auth.authentication import ABRAuth, DetailedUser
@@ -16,7 +19,13 @@ from app.util.connection import get_connection
 from app.util.db import get_session
 from app.util.templates import template_response
 
-router = APIRouter(prefix="/prowlarr")
+admin_auth = ABRAuth(GroupEnum.admin)
+router = APIRouter(prefix="/prowlarr", dependencies=[Security(admin_auth)])
+
+_HX_REFRESH_HEADERS: Mapping[str, str] = MappingProxyType({"HX-Refresh": "true"})
+
+# the categories never change, so serialize and escape them only once
+_indexer_categories_js = Markup.escape(json.dumps(indexer_categories))
 
 
 @router.get("")
@@ -25,7 +34,7 @@ async def read_prowlarr(
     session: Annotated[Session, Depends(get_session)],
     client_session: Annotated[ClientSession, Depends(get_connection)],
     prowlarr_misconfigured: Optional[Any] = None,
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     prowlarr_base_url = prowlarr_config.get_base_url(session)
     prowlarr_api_key = prowlarr_config.get_api_key(session)
@@ -41,7 +50,7 @@ async def read_prowlarr(
             "page": "prowlarr",
             "prowlarr_base_url": prowlarr_base_url or "",
             "prowlarr_api_key": prowlarr_api_key,
-            "indexer_categories": indexer_categories,
+            "indexer_categories": _indexer_categories_js,
             "selected_categories": selected,
             "indexers": indexers,
             "selected_indexers": selected_indexers,
@@ -54,22 +63,20 @@ async def read_prowlarr(
 def update_prowlarr_api_key(
     api_key: Annotated[str, Form()],
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
 ):
     prowlarr_config.set_api_key(session, api_key)
     flush_prowlarr_cache()
-    return Response(status_code=204, headers={"HX-Refresh": "true"})
+    return Response(status_code=204, headers=_HX_REFRESH_HEADERS)
 
 
 @router.put("/base-url")
 def update_prowlarr_base_url(
     base_url: Annotated[str, Form()],
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
 ):
     prowlarr_config.set_base_url(session, base_url)
     flush_prowlarr_cache()
-    return Response(status_code=204, headers={"HX-Refresh": "true"})
+    return Response(status_code=204, headers=_HX_REFRESH_HEADERS)
 
 
 @router.put("/category")
@@ -77,18 +84,18 @@ def update_indexer_categories(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
     categories: Annotated[list[int], Form(alias="c")] = [],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     prowlarr_config.set_categories(session, categories)
     selected = set(categories)
-    flush_prowlarr_cache()
+    flush_prowlarr_cache(sources_only=True)
 
     return template_response(
         "settings_page/prowlarr.html",
         request,
         admin_user,
         {
-            "indexer_categories": indexer_categories,
+            "indexer_categories": _indexer_categories_js,
             "selected_categories": selected,
             "success": "Categories updated",
         },
@@ -102,13 +109,13 @@ async def update_selected_indexers(
     session: Annotated[Session, Depends(get_session)],
     client_session: Annotated[ClientSession, Depends(get_connection)],
     indexer_ids: Annotated[list[int], Form(alias="i")] = [],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     prowlarr_config.set_indexers(session, indexer_ids)
 
     indexers = await get_indexers(session, client_session)
-    selected_indexers = set(prowlarr_config.get_indexers(session))
-    flush_prowlarr_cache()
+    selected_indexers = set(indexer_ids)
+    flush_prowlarr_cache(sources_only=True)
 
     return template_response(
         "settings_page/prowlarr.html",
@@ -1,13 +1,18 @@
-from typing import Annotated, Optional
+from types import MappingProxyType
+from typing import Annotated, Any, Mapping, Optional
 
 from aiohttp import ClientSession
 from fastapi import APIRouter, Depends, Form, Request, Response, Security
 from sqlmodel import Session
 
 from app.internal.auth.authentication import ABRAuth, DetailedUser
-from app.internal.auth.config import auth_config
+from app.internal.auth.config import AuthConfigKey, auth_config
 from app.internal.auth.login_types import LoginTypeEnum
-from app.internal.auth.oidc_config import InvalidOIDCConfiguration, oidc_config
+from app.internal.auth.oidc_config import (
+    InvalidOIDCConfiguration,
+    oidc_config,
+    oidcConfigKey,
+)
 from app.internal.env_settings import Settings
 from app.internal.models import GroupEnum
 from app.util.connection import get_connection
@@ -17,14 +22,64 @@ from app.util.templates import template_response
 from app.util.time import Minute
 from app.util.toast import ToastException
 
-router = APIRouter(prefix="/security")
+admin_auth = ABRAuth(GroupEnum.admin)
+router = APIRouter(prefix="/security", dependencies=[Security(admin_auth)])
+
+_HX_REFRESH_HEADERS: Mapping[str, str] = MappingProxyType({"HX-Refresh": "true"})
+
+
+def _get_security_context(
+    session: Session,
+    login_type: Optional[LoginTypeEnum] = None,
+    access_token_expiry: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Loads all the values displayed on the security page with one query per config.
+    Values that are already known (because they were just written) are not fetched again.
+    """
+    auth_keys: list[AuthConfigKey] = ["min_password_length"]
+    if login_type is None:
+        auth_keys.append("login_type")
+    if access_token_expiry is None:
+        auth_keys.append("access_token_expiry_minutes")
+    auth = auth_config.get_many(session, auth_keys)
+    oidc = oidc_config.get_many(
+        session,
+        [
+            "oidc_endpoint",
+            "oidc_client_secret",
+            "oidc_client_id",
+            "oidc_scope",
+            "oidc_username_claim",
+            "oidc_group_claim",
+            "oidc_redirect_https",
+            "oidc_logout_url",
+        ],
+    )
+    return {
+        "login_type": login_type
+        or LoginTypeEnum(auth.get("login_type", LoginTypeEnum.basic)),
+        "access_token_expiry": Minute(
+            access_token_expiry
+            or int(auth.get("access_token_expiry_minutes", 60 * 24 * 7))
+        ),
+        "min_password_length": int(auth.get("min_password_length", 1)),
+        "oidc_endpoint": oidc.get("oidc_endpoint", ""),
+        "oidc_client_secret": oidc.get("oidc_client_secret", ""),
+        "oidc_client_id": oidc.get("oidc_client_id", ""),
+        "oidc_scope": oidc.get("oidc_scope", ""),
+        "oidc_username_claim": oidc.get("oidc_username_claim", ""),
+        "oidc_group_claim": oidc.get("oidc_group_claim", ""),
+        "oidc_redirect_https": "oidc_redirect_https" in oidc,
+        "oidc_logout_url": oidc.get("oidc_logout_url", ""),
+    }
 
 
 @router.get("")
 def read_security(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     try:
         force_login_type = Settings().app.get_force_login_type()
@@ -38,17 +93,7 @@ def read_security(
         admin_user,
         {
             "page": "security",
-            "login_type": auth_config.get_login_type(session),
-            "access_token_expiry": auth_config.get_access_token_expiry_minutes(session),
-            "min_password_length": auth_config.get_min_password_length(session),
-            "oidc_endpoint": oidc_config.get(session, "oidc_endpoint", ""),
-            "oidc_client_secret": oidc_config.get(session, "oidc_client_secret", ""),
-            "oidc_client_id": oidc_config.get(session, "oidc_client_id", ""),
-            "oidc_scope": oidc_config.get(session, "oidc_scope", ""),
-            "oidc_username_claim": oidc_config.get(session, "oidc_username_claim", ""),
-            "oidc_group_claim": oidc_config.get(session, "oidc_group_claim", ""),
-            "oidc_redirect_https": oidc_config.get_redirect_https(session),
-            "oidc_logout_url": oidc_config.get(session, "oidc_logout_url", ""),
+            **_get_security_context(session),
             "force_login_type": force_login_type,
         },
     )
@@ -57,10 +102,9 @@ def read_security(
 @router.post("/reset-auth")
 def reset_auth_secret(
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
 ):
     auth_config.reset_auth_secret(session)
-    return Response(status_code=204, headers={"HX-Refresh": "true"})
+    return Response(status_code=204, headers=_HX_REFRESH_HEADERS)
 
 
 @router.post("")
@@ -79,7 +123,7 @@ async def update_security(
     oidc_group_claim: Optional[str] = Form(None),
     oidc_redirect_https: Optional[bool] = Form(False),
     oidc_logout_url: Optional[str] = Form(None),
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     if (
         login_type in [LoginTypeEnum.basic, LoginTypeEnum.forms]
@@ -106,24 +150,22 @@ async def update_security(
                 await oidc_config.set_endpoint(session, client_session, oidc_endpoint)
             except InvalidOIDCConfiguration as e:
                 raise ToastException(f"Invalid OIDC endpoint: {e.detail}", "error")
+        updates: dict[oidcConfigKey, str] = {}
         if oidc_client_id:
-            oidc_config.set(session, "oidc_client_id", oidc_client_id)
+            updates["oidc_client_id"] = oidc_client_id
         if oidc_client_secret:
-            oidc_config.set(session, "oidc_client_secret", oidc_client_secret)
+            updates["oidc_client_secret"] = oidc_client_secret
         if oidc_scope:
-            oidc_config.set(session, "oidc_scope", oidc_scope)
+            updates["oidc_scope"] = oidc_scope
         if oidc_username_claim:
-            oidc_config.set(session, "oidc_username_claim", oidc_username_claim)
+            updates["oidc_username_claim"] = oidc_username_claim
         if oidc_redirect_https is not None:
-            oidc_config.set(
-                session,
-                "oidc_redirect_https",
-                "true" if oidc_redirect_https else "",
-            )
+            updates["oidc_redirect_https"] = "true" if oidc_redirect_https else ""
         if oidc_logout_url:
-            oidc_config.set(session, "oidc_logout_url", oidc_logout_url)
+            updates["oidc_logout_url"] = oidc_logout_url
         if oidc_group_claim is not None:
-            oidc_config.set(session, "oidc_group_claim", oidc_group_claim)
+            updates["oidc_group_claim"] = oidc_group_claim
+        oidc_config.set_many(session, updates)
 
         error_message = await oidc_config.validate(session, client_session)
         if error_message:
@@ -149,19 +191,10 @@ async def update_security(
         admin_user,
         {
             "page": "security",
-            "login_type": auth_config.get_login_type(session),
-            "access_token_expiry": auth_config.get_access_token_expiry_minutes(session),
-            "oidc_client_id": oidc_config.get(session, "oidc_client_id", ""),
-            "oidc_scope": oidc_config.get(session, "oidc_scope", ""),
-            "oidc_username_claim": oidc_config.get(session, "oidc_username_claim", ""),
-            "oidc_group_claim": oidc_config.get(session, "oidc_group_claim", ""),
-            "oidc_client_secret": oidc_config.get(session, "oidc_client_secret", ""),
-            "oidc_endpoint": oidc_config.get(session, "oidc_endpoint", ""),
-            "oidc_redirect_https": oidc_config.get_redirect_https(session),
-            "oidc_logout_url": oidc_config.get(session, "oidc_logout_url", ""),
+            **_get_security_context(session, login_type, access_token_expiry),
             "force_login_type": force_login_type,
             "success": "Settings updated",
         },
         block_name="form",
-        headers={} if old == login_type else {"HX-Refresh": "true"},
+        headers=None if old == login_type else _HX_REFRESH_HEADERS,
     )
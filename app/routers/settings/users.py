@@ -1,4 +1,4 @@
-from typing import Annotated, Optional
+from typing import Annotated, NamedTuple, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, Security
 from sqlmodel import Session, select
@@ -15,17 +15,51 @@ from app.internal.models import GroupEnum, User
 from app.util.db import get_session
 from app.util.templates import template_response
 from app.util.toast import ToastException
+from app.util.wishlist_cache import flush_wishlist_counts
 
-router = APIRouter(prefix="/users")
+admin_auth = ABRAuth(GroupEnum.admin)
+router = APIRouter(prefix="/users", dependencies=[Security(admin_auth)])
+
+_GROUP_NAMES: frozenset[str] = frozenset(GroupEnum.__members__)
+_UPDATE_MESSAGES: dict[frozenset[str], str] = {
+    frozenset(): "No changes made",
+    frozenset({"extra data"}): "Updated user extra data",
+    frozenset({"group"}): "Updated group",
+}
+
+
+class UserRow(NamedTuple):
+    """The columns shown in the user list. Skips the password hash."""
+
+    username: str
+    group: GroupEnum
+    root: bool
+    extra_data: Optional[str]
+
+    def is_self(self, username: str):
+        return self.username == username
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserRow":
+        return cls(user.username, user.group, user.root, user.extra_data)
+
+
+def _get_user_rows(session: Session) -> list[UserRow]:
+    return [
+        UserRow(*row)
+        for row in session.exec(
+            select(User.username, User.group, User.root, User.extra_data)
+        ).all()
+    ]
 
 
 @router.get("")
 def read_users(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
-    users = session.exec(select(User)).all()
+    users = _get_user_rows(session)
     is_oidc = auth_config.get_login_type(session) == LoginTypeEnum.oidc
     return template_response(
         "settings_page/users.html",
@@ -46,7 +80,7 @@ def create_new_user(
     password: Annotated[str, Form()],
     group: Annotated[str, Form()],
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     if username.strip() == "":
         raise ToastException("Invalid username", "error")
@@ -56,27 +90,26 @@ def create_new_user(
     except HTTPException as e:
         raise ToastException(e.detail, "error")
 
-    if group not in GroupEnum.__members__:
+    if group not in _GROUP_NAMES:
         raise ToastException("Invalid group selected", "error")
 
     group = GroupEnum[group]
 
-    user = session.exec(select(User).where(User.username == username)).first()
-    if user:
+    if session.get(User, username):
         raise ToastException("Username already exists", "error")
 
     user = create_user(username, password, group)
+    row = UserRow.from_user(user)
     session.add(user)
     session.commit()
 
-    users = session.exec(select(User)).all()
-
+    # only the new row is sent back and appended to the table
     return template_response(
         "settings_page/users.html",
         request,
         admin_user,
-        {"users": users, "success": "Created user"},
-        block_name="user_block",
+        {"u": row, "row_success": "Created user"},
+        block_name="user_row",
     )
 
 
@@ -85,27 +118,28 @@ def delete_user(
     request: Request,
     username: str,
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
 ):
     if username == admin_user.username:
         raise ToastException("Cannot delete own user", "error")
 
-    user = session.exec(select(User).where(User.username == username)).one_or_none()
+    user = session.get(User, username)
     if user and user.root:
         raise ToastException("Cannot delete root user", "error")
 
     if user:
         session.delete(user)
         session.commit()
+        # the user's requests are deleted with it
+        flush_wishlist_counts()
 
-    users = session.exec(select(User)).all()
-
+    # an empty row replaces the deleted one
     return template_response(
         "settings_page/users.html",
         request,
         admin_user,
-        {"users": users, "success": "Deleted user"},
-        block_name="user_block",
+        {"u": None, "row_success": "Deleted user"},
+        block_name="user_row",
     )
 
 
@@ -114,38 +148,32 @@ def update_user(
     request: Request,
     username: str,
     session: Annotated[Session, Depends(get_session)],
-    admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
+    admin_user: DetailedUser = Security(admin_auth),
     group: Annotated[Optional[GroupEnum], Form()] = None,
     extra_data: Annotated[Optional[str], Form()] = None,
 ):
     updated: list[str] = []
-    user = session.exec(select(User).where(User.username == username)).one_or_none()
+    row: Optional[UserRow] = None
+    user = session.get(User, username)
     if user:
         if extra_data is not None:
             updated.append("extra data")
-            user.extra_data = extra_data.strip() if extra_data.strip() != "" else None
+            user.extra_data = extra_data.strip() or None
         if group is not None:
             if user.root:
                 raise ToastException("Cannot change root user's group", "error")
             user.group = group
             updated.append("group")
+        row = UserRow.from_user(user)
         session.add(user)
         session.commit()
 
-    if not updated:
-        success_msg = "No changes made"
-    elif updated == ["extra data"]:
-        success_msg = "Updated user extra data"
-    elif updated == ["group"]:
-        success_msg = "Updated group"
-    else:
-        success_msg = "Updated user"
+    success_msg = _UPDATE_MESSAGES.get(frozenset(updated), "Updated user")
 
-    users = session.exec(select(User)).all()
     return template_response(
         "settings_page/users.html",
         request,
         admin_user,
-        {"users": users, "success": success_msg},
-        block_name="user_block",
+        {"u": row, "row_success": success_msg},
+        block_name="user_row",
     )
@@ -1,5 +1,5 @@
 import uuid
-from collections import defaultdict
+from functools import partial
 from typing import Annotated, Literal, Optional
 
 from aiohttp import ClientSession
@@ -13,20 +13,22 @@ from fastapi import (
     Response,
     Security,
 )
-from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import case, func, lambda_stmt, update
 from sqlmodel import Session, asc, col, not_, select
 
 from app.internal.auth.authentication import ABRAuth, DetailedUser
 from app.internal.models import (
+    BaseBook,
     BookRequest,
     BookWishlistResult,
     EventEnum,
     GroupEnum,
     ManualBookRequest,
     User,
+    WishlistCounts,
 )
 from app.internal.notifications import (
+    queue_notifications,
     send_all_manual_notifications,
     send_all_notifications,
 )
@@ -42,14 +44,30 @@ from app.util.connection import get_connection
 from app.util.db import get_session, open_session
 from app.util.redirect import BaseUrlRedirectResponse
 from app.util.templates import template_response
+from app.util.wishlist_cache import (
+    WISHLIST_COUNTS_TTL,
+    flush_wishlist_counts,
+    wishlist_counts_cache,
+)
 
 router = APIRouter(prefix="/wishlist")
 
+# the columns BookWishlistResult is built from
+_WISHLIST_BOOK_COLUMNS = tuple(
+    getattr(BookRequest, name) for name in BaseBook.model_fields
+)
+
 
-class WishlistCounts(BaseModel):
-    requests: int
-    downloaded: int
-    manual: int
+def _user_filter(
+    model: type[BookRequest] | type[ManualBookRequest], username: Optional[str]
+):
+    """
+    Requests of the given user, or all requests with a user if no username is given.
+    The equality check already excludes requests without a user.
+    """
+    if username:
+        return col(model.user_username) == username
+    return col(model.user_username).is_not(None)
 
 
 def get_wishlist_counts(
@@ -57,41 +75,42 @@ def get_wishlist_counts(
 ) -> WishlistCounts:
     """Optional user limits results to only the current user if they are not an admin."""
     username = None if user is None or user.is_admin() else user.username
+    if cached := wishlist_counts_cache.get(WISHLIST_COUNTS_TTL, username):
+        return cached
 
-    downloaded = session.exec(
-        select(func.count(func.distinct(BookRequest.asin)))
-        .where(
-            BookRequest.downloaded,
-            not username or BookRequest.user_username == username,
-            col(BookRequest.user_username).is_not(None),
-        )
-        .select_from(BookRequest)
-    ).one()
-
-    requests = session.exec(
-        select(func.count(func.distinct(BookRequest.asin)))
-        .where(
-            not_(BookRequest.downloaded),
-            not username or BookRequest.user_username == username,
-            col(BookRequest.user_username).is_not(None),
-        )
-        .select_from(BookRequest)
-    ).one()
-
-    manual = session.exec(
+    manual = (
         select(func.count())
         .select_from(ManualBookRequest)
-        .where(
-            not username or ManualBookRequest.user_username == username,
-            col(ManualBookRequest.user_username).is_not(None),
-        )
+        .where(_user_filter(ManualBookRequest, username))
+        .scalar_subquery()
+    )
+
+    # Grouping first instead of COUNT(DISTINCT asin) lets Postgres use a (parallel)
+    # hash aggregate instead of sorting every asin. Each (asin, downloaded) pair is
+    # one distinct book in either count.
+    books = (
+        select(BookRequest.asin, BookRequest.downloaded)
+        .where(_user_filter(BookRequest, username))
+        .group_by(BookRequest.asin, BookRequest.downloaded)
+        .subquery()
+    )
+
+    # all three counts in a single round-trip
+    requests, downloaded, manual = session.exec(
+        select(
+            func.count(case((not_(books.c.downloaded), 1))),
+            func.count(case((books.c.downloaded, 1))),
+            manual,
+        ).select_from(books)
     ).one()
 
-    return WishlistCounts(
+    counts = WishlistCounts(
         requests=requests,
         downloaded=downloaded,
         manual=manual,
     )
+    wishlist_counts_cache.set(counts, username)
+    return counts
 
 
 def get_wishlist_books(
@@ -103,28 +122,56 @@ def get_wishlist_books(
     Gets the books that have been requested. If a username is given only the books requested by that
     user are returned. If no username is given, all book requests are returned.
     """
-    book_requests = session.exec(
-        select(BookRequest).where(
-            not username or BookRequest.user_username == username,
-            col(BookRequest.user_username).is_not(None),
+    user_filter = _user_filter(BookRequest, username)
+
+    # one row per asin. The book details are the same on every request of a book.
+    # Only the book columns are selected, so no ORM objects have to be created
+    if session.get_bind().dialect.name == "postgresql":
+        distinct_books = session.execute(  # pyright: ignore[reportDeprecated]
+            select(*_WISHLIST_BOOK_COLUMNS)
+            .where(user_filter)
+            .distinct(BookRequest.asin)
+            .order_by(BookRequest.asin, BookRequest.id)
+        ).all()
+    else:
+        ranked = (
+            select(
+                *_WISHLIST_BOOK_COLUMNS,
+                func.row_number()
+                .over(partition_by=BookRequest.asin, order_by=BookRequest.id)
+                .label("rank"),
+            )
+            .where(user_filter)
+            .subquery()
         )
-    ).all()
-
-    # group by asin and aggregate all usernames
-    usernames: dict[str, list[str]] = defaultdict(list)
-    distinct_books: dict[str, BookRequest] = {}
-    for book in book_requests:
-        if book.asin not in distinct_books:
-            distinct_books[book.asin] = book
-        if book.user_username:
-            usernames[book.asin].append(book.user_username)
+        distinct_books = session.execute(  # pyright: ignore[reportDeprecated]
+            select(*(ranked.c[name] for name in BaseBook.model_fields)).where(
+                ranked.c.rank == 1
+            )
+        ).all()
+
+    # usernames of everyone that requested a book, aggregated by the database
+    requesters = lambda_stmt(
+        lambda: select(
+            BookRequest.asin,
+            func.aggregate_strings(BookRequest.user_username, "\n"),
+        ).group_by(BookRequest.asin)
+    )
+    if username:
+        requesters += lambda s: s.where(col(BookRequest.user_username) == username)
+    else:
+        requesters += lambda s: s.where(col(BookRequest.user_username).is_not(None))
+    usernames: dict[str, str] = dict(session.execute(requesters).tuples().all())  # pyright: ignore[reportDeprecated]
 
     # add information of what users requested the book
     books: list[BookWishlistResult] = []
     downloaded: list[BookWishlistResult] = []
-    for asin, book in distinct_books.items():
-        b = BookWishlistResult.model_validate(book)
-        b.requested_by = usernames[asin]
+    for book in distinct_books:
+        requested_by = usernames.get(book.asin)
+        if requested_by is None:
+            # the requests were deleted between the two queries
+            continue
+        b = BookWishlistResult(**book._mapping, requested_by=requested_by.split("\n"))
         if b.downloaded:
             downloaded.append(b)
         else:
@@ -138,7 +185,7 @@ def get_wishlist_books(
 
 
 @router.get("")
-async def wishlist(
+def wishlist(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
     user: DetailedUser = Security(ABRAuth()),
@@ -155,7 +202,7 @@ async def wishlist(
 
 
 @router.get("/downloaded")
-async def downloaded(
+def downloaded(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
     user: DetailedUser = Security(ABRAuth()),
@@ -180,25 +227,29 @@ async def update_downloaded(
     client_session: Annotated[ClientSession, Depends(get_connection)],
     admin_user: DetailedUser = Security(ABRAuth(GroupEnum.admin)),
 ):
-    books = session.exec(
-        select(BookRequest, User)
-        .join(User, isouter=True)
-        .where(BookRequest.asin == asin)
-    ).all()
-
-    requested_by = [User.model_validate(user) for [_, user] in books if user]
-
-    for [book, _] in books:
-        book.downloaded = True
-        session.add(book)
+    requested_by = (
+        session.execute(  # pyright: ignore[reportDeprecated]
+            update(BookRequest)
+            .where(col(BookRequest.asin) == asin)
+            .values(downloaded=True)
+            .returning(BookRequest.user_username)
+        )
+        .scalars()
+        .all()
+    )
     session.commit()
-
-    if len(requested_by) > 0:
-        background_task.add_task(
-            send_all_notifications,
-            event_type=EventEnum.on_successful_download,
-            requester=requested_by[0],  # TODO: support multiple requesters
-            book_asin=asin,
+    flush_wishlist_counts()
+
+    # TODO: support multiple requesters
+    requester_name = next((u for u in requested_by if u), None)
+    if requester_name and (requester := session.get(User, requester_name)):
+        queue_notifications(
+            partial(
+                send_all_notifications,
+                event_type=EventEnum.on_successful_download,
+                requester=User.model_validate(requester),
+                book_asin=asin,
+            )
         )
 
     # Trigger ABS library scan in background if configured
@@ -224,18 +275,22 @@ async def update_downloaded(
 
 
 def _get_all_manual_requests(session: Session, user: User):
-    return session.exec(
-        select(ManualBookRequest)
-        .where(
-            user.is_admin() or ManualBookRequest.user_username == user.username,
-            col(ManualBookRequest.user_username).is_not(None),
-        )
-        .order_by(asc(ManualBookRequest.downloaded))
-    ).all()
+    # lambda statement, so SQLAlchemy caches the statement and only binds the username.
+    # ix_mbr_user_dl (user_username, downloaded) serves the per-user case already sorted;
+    # the admin case matches every requester and still sorts on downloaded.
+    stmt = lambda_stmt(
+        lambda: select(ManualBookRequest).order_by(asc(ManualBookRequest.downloaded))
+    )
+    if user.is_admin():
+        stmt += lambda s: s.where(col(ManualBookRequest.user_username).is_not(None))
+    else:
+        username = user.username
+        stmt += lambda s: s.where(col(ManualBookRequest.user_username) == username)
+    return session.scalars(stmt).all()
 
 
 @router.get("/manual")
-async def manual(
+def manual(
     request: Request,
     session: Annotated[Session, Depends(get_session)],
     user: DetailedUser = Security(ABRAuth()),
@@ -265,35 +320,32 @@ async def downloaded_manual(
         session.add(book_request)
         session.commit()
 
-        background_task.add_task(
-            send_all_manual_notifications,
-            event_type=EventEnum.on_successful_download,
-            book_request=ManualBookRequest.model_validate(book_request),
+        queue_notifications(
+            partial(
+                send_all_manual_notifications,
+                event_type=EventEnum.on_successful_download,
+                book_request=ManualBookRequest.model_validate(book_request),
+            )
         )
 
         # Trigger ABS library scan in background if configured
         if abs_config.is_valid(session):
             background_task.add_task(abs_trigger_scan, session, client_session)
 
+    # the manual table block doesn't render the tablist, so no counts are needed
     books = _get_all_manual_requests(session, admin_user)
-    counts = get_wishlist_counts(session, admin_user)
 
     return template_response(
         "wishlist_page/manual.html",
         request,
         admin_user,
-        {
-            "books": books,
-            "page": "manual",
-            "counts": counts,
-            "update_tablist": True,
-        },
+        {"books": books, "page": "manual"},
         block_name="book_wishlist",
     )
 
 
 @router.delete("/manual/{id}")
-async def delete_manual(
+def delete_manual(
     request: Request,
     id: uuid.UUID,
     session: Annotated[Session, Depends(get_session)],
@@ -303,24 +355,33 @@ async def delete_manual(
     if book:
         session.delete(book)
         session.commit()
+        flush_wishlist_counts()
 
+    # the manual table block doesn't render the tablist, so no counts are needed
     books = _get_all_manual_requests(session, admin_user)
-    counts = get_wishlist_counts(session, admin_user)
 
     return template_response(
         "wishlist_page/manual.html",
         request,
         admin_user,
-        {
-            "books": books,
-            "page": "manual",
-            "counts": counts,
-            "update_tablist": True,
-        },
+        {"books": books, "page": "manual"},
         block_name="book_wishlist",
     )
 
 
+async def background_refresh_sources(asin: str, requester: User, force_refresh: bool):
+    # the sessions are opened once the task runs, request scoped ones are closed by then
+    with open_session() as session:
+        async with ClientSession() as client_session:
+            await query_sources(
+                asin=asin,
+                session=session,
+                client_session=client_session,
+                force_refresh=force_refresh,
+                requester=requester,
+            )
+
+
 @router.post("/refresh/{asin}")
 async def refresh_source(
     asin: str,
@@ -329,16 +390,12 @@ async def refresh_source(
     user: DetailedUser = Security(ABRAuth()),
 ):
     # causes the sources to be placed into cache once they're done
-    with open_session() as session:
-        async with ClientSession() as client_session:
-            background_task.add_task(
-                query_sources,
-                asin=asin,
-                session=session,
-                client_session=client_session,
-                force_refresh=force_refresh,
-                requester=User.model_validate(user),
-            )
+    background_task.add_task(
+        background_refresh_sources,
+        asin=asin,
+        requester=User.model_validate(user),
+        force_refresh=force_refresh,
+    )
     return Response(status_code=202)
 
 
@@ -405,11 +462,11 @@ async def download_book(
     if not resp.ok:
         raise HTTPException(status_code=500, detail="Failed to start download")
 
-    book = session.exec(select(BookRequest).where(BookRequest.asin == asin)).all()
-    for b in book:
-        b.downloaded = True
-        session.add(b)
+    session.execute(  # pyright: ignore[reportDeprecated]
+        update(BookRequest).where(col(BookRequest.asin) == asin).values(downloaded=True)
+    )
     session.commit()
+    flush_wishlist_counts()
 
     # Trigger ABS library scan in background if configured
     if abs_config.is_valid(session):
@@ -441,10 +498,11 @@ async def start_auto_download(
         download_error = e.detail
 
     username = None if user.is_admin() else user.username
-    books = get_wishlist_books(session, username)
+    books = get_wishlist_books(session, username, "not_downloaded")
     if download_error:
-        errored_book = [b for b in books if b.asin == asin][0]
-        errored_book.download_error = download_error
+        errored_book = next((b for b in books if b.asin == asin), None)
+        if errored_book:
+            errored_book.download_error = download_error
 
     counts = get_wishlist_counts(session, user)
 
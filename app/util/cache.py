@@ -1,14 +1,17 @@
 import time
 from abc import ABC
-from typing import Optional, overload
+from typing import Mapping, Optional, Sequence, overload
 
-from sqlmodel import Session, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, col, select
 
 from app.internal.models import Config
 
 
 class SimpleCache[VT, *KTs]:
-    _cache: dict[tuple[*KTs], tuple[int, VT]] = {}
+    def __init__(self):
+        # per instance, so separate caches don't share (and flush) each others entries
+        self._cache: dict[tuple[*KTs], tuple[int, VT]] = {}
 
     def get(self, source_ttl: int, *query: *KTs) -> Optional[VT]:
         hit = self._cache.get(query)
@@ -56,6 +59,22 @@ class StringConfigCache[L: str](ABC):
             or default
         )
 
+    def get_many(self, session: Session, keys: Sequence[L]) -> dict[L, str]:
+        """
+        Fetches multiple keys with a single query. Keys without a (non-empty) value are
+        left out of the returned dict.
+        """
+        values: dict[L, str] = {
+            key: self._cache[key] for key in keys if key in self._cache
+        }
+        missing = [key for key in keys if key not in values]
+        if missing:
+            rows = session.exec(
+                select(Config.key, Config.value).where(col(Config.key).in_(missing))
+            ).all()
+            values.update({key: value for key, value in rows if value})  # pyright: ignore[reportArgumentType]
+        return {key: value for key, value in values.items() if value}
+
     def set(self, session: Session, key: L, value: str):
         old = session.exec(select(Config).where(Config.key == key)).one_or_none()
         if old:
@@ -66,6 +85,22 @@ class StringConfigCache[L: str](ABC):
         session.commit()
         self._cache[key] = value
 
+    def set_many(self, session: Session, items: Mapping[L, str]):
+        """Upserts multiple keys with a single statement"""
+        if not items:
+            return
+        if session.get_bind().dialect.name == "postgresql":
+            stmt = postgresql.insert(Config)
+        else:
+            stmt = sqlite.insert(Config)
+        stmt = stmt.values([{"key": k, "value": v} for k, v in items.items()])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Config.key], set_={"value": stmt.excluded.value}
+        )
+        session.execute(stmt)  # pyright: ignore[reportDeprecated]
+        session.commit()
+        self._cache.update(items)
+
     def delete(self, session: Session, key: L):
         old = session.exec(select(Config).where(Config.key == key)).one_or_none()
         if old:
@@ -1,24 +1,40 @@
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
-from sqlmodel import Session, text
+from sqlalchemy import create_engine, event
+from sqlmodel import Session
 
 from app.internal.env_settings import Settings
 
 db = Settings().db
+# room for all the distinct statements the app compiles, so they're only compiled once
+_QUERY_CACHE_SIZE = 1200
+
 if db.use_postgres:
     engine = create_engine(
-        f"postgresql://{db.postgres_user}:{db.postgres_password}@{db.postgres_host}:{db.postgres_port}/{db.postgres_db}?sslmode={db.postgres_ssl_mode}"
+        f"postgresql://{db.postgres_user}:{db.postgres_password}@{db.postgres_host}:{db.postgres_port}/{db.postgres_db}?sslmode={db.postgres_ssl_mode}",
+        query_cache_size=_QUERY_CACHE_SIZE,
     )
 else:
     sqlite_path = Settings().get_sqlite_path()
-    engine = create_engine(f"sqlite+pysqlite:///{sqlite_path}")
+    engine = create_engine(
+        f"sqlite+pysqlite:///{sqlite_path}", query_cache_size=_QUERY_CACHE_SIZE
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record):  # pyright: ignore[reportUnusedFunction,reportMissingParameterType,reportUnknownParameterType]
+        # pragmas apply to the connection, so they only have to be set once when it's
+        # opened instead of for every session
+        cursor = dbapi_connection.cursor()  # pyright: ignore[reportUnknownMemberType,reportUnknownVariableType]
+        cursor.execute("PRAGMA foreign_keys=ON")  # pyright: ignore[reportUnknownMemberType]
+        if db.sqlite_wal:
+            # persistent on the database file and not supported on network filesystems
+            cursor.execute("PRAGMA journal_mode=WAL")  # pyright: ignore[reportUnknownMemberType]
+            cursor.execute("PRAGMA synchronous=NORMAL")  # pyright: ignore[reportUnknownMemberType]
+        cursor.close()  # pyright: ignore[reportUnknownMemberType]
 
 
 def get_session():
     with Session(engine) as session:
-        if not Settings().db.use_postgres:
-            session.execute(text("PRAGMA foreign_keys=ON"))  # pyright: ignore[reportDeprecated]
         yield session
 
 
@@ -26,6 +42,4 @@ def get_session():
 @contextmanager
 def open_session():
     with Session(engine) as session:
-        if not Settings().db.use_postgres:
-            session.execute(text("PRAGMA foreign_keys=ON"))  # pyright: ignore[reportDeprecated]
         yield session
@@ -1,12 +1,16 @@
 type JSON = str | int | float | bool | None | dict[str, "JSON"] | list["JSON"]
 
+_TRUE_STRINGS = frozenset(("true", "1", "yes", "on"))
+_FALSE_STRINGS = frozenset(("false", "0", "no", "off"))
+
 
 def get_bool(value: JSON) -> bool | None:
     if isinstance(value, bool):
         return value
     if isinstance(value, str):
-        if value.lower() in ("true", "1", "yes", "on"):
+        value = value.lower()
+        if value in _TRUE_STRINGS:
             return True
-        if value.lower() in ("false", "0", "no", "off"):
+        if value in _FALSE_STRINGS:
             return False
     return None
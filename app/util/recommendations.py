@@ -3,18 +3,20 @@ Recommendation engine utilities for generating book suggestions based on user ac
 """
 
 import asyncio
+import heapq
 import time
-import hashlib
-from collections import Counter, defaultdict
+import zlib
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Optional, Iterable, Tuple, Dict, List
+from itertools import chain
+from typing import NamedTuple, Optional, Iterable, Tuple, Dict
 
 from aiohttp import ClientSession
 import pydantic
-from sqlalchemy import func
+from sqlalchemy import ColumnElement, TableValuedAlias, func, or_, true
 from sqlmodel import Session, col, desc, select
 
-from app.internal.models import BookRequest, BookSearchResult, User
+from app.internal.models import BaseBook, BookRequest, BookSearchResult, User
 
 # Simple in-memory cache for per-user recommendation pools
 class _UserRecsCacheKey(pydantic.BaseModel, frozen=True):
@@ -25,11 +27,63 @@ class _UserRecsCacheKey(pydantic.BaseModel, frozen=True):
 class _UserRecsCacheEntry(pydantic.BaseModel):
     value: list[BookSearchResult]
     reasons: dict[str, str] = {}
+    depth: int  # the limit the pool was computed with
     timestamp: float
 
 
 _USER_RECS_CACHE: dict[_UserRecsCacheKey, _UserRecsCacheEntry] = {}
 _USER_RECS_TTL = 60 * 60 * 3  # 3 hours
+_USER_RECS_MAX_ENTRIES = 512
+# pools currently being computed, so concurrent requests for the same pool share the work
+_USER_RECS_INFLIGHT: dict[_UserRecsCacheKey, asyncio.Future[_UserRecsCacheEntry]] = {}
+
+
+def _store_user_recs(key: _UserRecsCacheKey, entry: _UserRecsCacheEntry):
+    # Drop expired entries, then the oldest ones, so the cache can't grow without bound
+    now = time.time()
+    expired = [k for k, v in _USER_RECS_CACHE.items() if now - v.timestamp >= _USER_RECS_TTL]
+    for k in expired:
+        del _USER_RECS_CACHE[k]
+    _USER_RECS_CACHE.pop(key, None)
+    while len(_USER_RECS_CACHE) >= _USER_RECS_MAX_ENTRIES:
+        del _USER_RECS_CACHE[next(iter(_USER_RECS_CACHE))]
+    _USER_RECS_CACHE[key] = entry
+
+
+_BOOK_FIELDS = tuple(BaseBook.model_fields)
+
+
+def _to_search_result(book: BaseBook, already_requested: bool) -> BookSearchResult:
+    """Copy an already validated book into a search result without validating it again."""
+    return BookSearchResult.model_construct(
+        **{f: getattr(book, f) for f in _BOOK_FIELDS}, already_requested=already_requested
+    )
+
+
+class _UserRequest(NamedTuple):
+    """The columns of a user's request the recommendations use. Plain values, so commits
+    made while building the recommendations don't expire them."""
+
+    asin: str
+    title: str
+    authors: list[str]
+    narrators: list[str]
+    updated_at: datetime
+
+
+def _get_user_requests(session: Session, user: User) -> list[_UserRequest]:
+    return [
+        _UserRequest(*row)
+        for row in session.exec(
+            select(
+                BookRequest.asin,
+                BookRequest.title,
+                BookRequest.authors,
+                BookRequest.narrators,
+                BookRequest.updated_at,
+            ).where(BookRequest.user_username == user.username)
+        ).all()
+    ]
 
 
 async def get_user_sims_recommendations(
@@ -38,6 +92,7 @@ async def get_user_sims_recommendations(
     user: User,
     seed_asins: Optional[Iterable[str]] = None,
     limit: int = 12,
+    user_requests: Optional[list[_UserRequest]] = None,
 ) -> list[BookSearchResult]:
     """
     Build personalized recommendations by aggregating Audible "similar" results
@@ -51,22 +106,20 @@ async def get_user_sims_recommendations(
     - Exclude already requested by the user
     - Exclude already downloaded/owned (if detectable)
     - Exclude duplicates
+
+    `user_requests` can be passed if the caller already loaded the user's requests.
     """
     from app.internal.book_search import list_similar_audible_books
     from app.util.log import logger
 
     # Collect user's requested books as default seeds
-    user_requests: list[BookRequest] = session.exec(
-        select(BookRequest).where(BookRequest.user_username == user.username)
-    ).all()
+    if user_requests is None:
+        user_requests = _get_user_requests(session, user)
     user_seed_asins = [b.asin for b in user_requests if b.asin]
 
     # User preference profiles
-    user_authors: Counter[str] = Counter()
-    user_narrators: Counter[str] = Counter()
-    for b in user_requests:
-        user_authors.update(b.authors)
-        user_narrators.update(b.narrators)
+    user_authors: Counter[str] = Counter(chain.from_iterable(b.authors for b in user_requests))
+    user_narrators: Counter[str] = Counter(chain.from_iterable(b.narrators for b in user_requests))
 
     seeds: list[str] = []
     if seed_asins:
@@ -82,7 +135,7 @@ async def get_user_sims_recommendations(
 
     # If no seeds, fall back to simple personalized heuristic
     if not seed_list:
-        return get_user_recommendations(session, user, limit)
+        return get_user_recommendations(session, user, limit, user_requests=user_requests)
 
     # Fetch sims for each seed concurrently (up to a reasonable cap)
     seed_list = seed_list[:20]  # cap to avoid excessive requests
@@ -104,9 +157,9 @@ async def get_user_sims_recommendations(
     except Exception as e:
         logger.debug("Gather sims failed", error=str(e))
 
-    # Aggregate by ASIN: count frequency and positions
+    # Aggregate by ASIN: count frequency and sum of positions
     freq: Counter[str] = Counter()
-    positions: defaultdict[str, list[int]] = defaultdict(list)
+    pos_sum: Counter[str] = Counter()
     book_map: dict[str, BookRequest] = {}
 
     for sims in all_sims_lists:
@@ -114,29 +167,18 @@ async def get_user_sims_recommendations(
             if not b.asin:
                 continue
             freq[b.asin] += 1
-            positions[b.asin].append(idx)
+            pos_sum[b.asin] += idx
             # Keep the first seen instance for map
             if b.asin not in book_map:
                 book_map[b.asin] = b
 
     if not freq:
         # Fallback
-        return get_user_recommendations(session, user, limit)
+        return get_user_recommendations(session, user, limit, user_requests=user_requests)
 
     # Build set of exclusions: already requested by user and downloaded
     user_requested_asins = {b.asin for b in user_requests}
 
-    # Attempt to mark downloaded via ABS if configured (best-effort)
-    try:
-        from app.internal.audiobookshelf.config import abs_config
-        from app.internal.audiobookshelf.client import abs_mark_downloaded_flags
-        if abs_config.is_valid(session) and abs_config.get_check_downloaded(session):
-            # Mark on a subset of candidates to avoid heavy calls
-            subset = list(book_map.values())[:30]
-            await abs_mark_downloaded_flags(session, client_session, subset)
-    except Exception as e:
-        logger.debug("ABS exist check skipped", error=str(e))
-
     # Scoring weights
     W_FREQ = 10.0         # how often candidate appears across seeds
     W_RANK = 3.0          # audible average position (lower is better)
@@ -148,14 +190,9 @@ async def get_user_sims_recommendations(
         # Convert average index to a 0..1 score (higher is better)
         return 1.0 / (1.0 + avg_idx)
 
-    def _pref_component(names: list[str], pref_counter: Counter[str]) -> float:
-        if not names:
-            return 0.0
-        return sum(pref_counter.get(n, 0) for n in names) / max(1.0, len(names))
-
-    def _recent_component(b: BookRequest) -> float:
+    def _recent_component(b: BookRequest, now_dt: datetime) -> float:
         try:
-            age_days = max(0.0, (datetime.now() - b.release_date).days)
+            age_days = max(0.0, (now_dt - b.release_date).days)
             # Newer books get up to ~1.0 bonus, decaying over ~2 years
             return max(0.0, 1.0 - (age_days / 730.0))
         except Exception:
@@ -163,93 +200,105 @@ async def get_user_sims_recommendations(
 
     # Build candidate score list
     cand_scores: list[tuple[BookRequest, float, int, float]] = []
-    reasons_map: dict[str, str] = {}
+    now_dt = datetime.now()
     for asin, count in freq.items():
         b = book_map.get(asin)
         if not b:
             continue
         if asin in user_requested_asins:
             continue
-        if getattr(b, "downloaded", False):
+        if b.downloaded:
             continue
 
-        avg_pos = sum(positions[asin]) / max(1, len(positions[asin]))
+        avg_pos = pos_sum[asin] / count
+        recent = _recent_component(b, now_dt)
+        # Average preference of the book's authors/narrators; Counter gives 0 for unknown names
+        authors, narrators = b.authors, b.narrators
+        author_pref = sum(user_authors[a] for a in authors) / len(authors) if authors else 0.0
+        narr_pref = sum(user_narrators[n] for n in narrators) / len(narrators) if narrators else 0.0
         score = (
             W_FREQ * float(count)
             + W_RANK * _rank_component(avg_pos)
-            + W_AUTHOR_PREF * _pref_component(b.authors, user_authors)
-            + W_NARR_PREF * _pref_component(b.narrators, user_narrators)
-            + W_RECENT * _recent_component(b)
+            + W_AUTHOR_PREF * author_pref
+            + W_NARR_PREF * narr_pref
+            + W_RECENT * recent
         )
         cand_scores.append((b, score, count, avg_pos))
 
-        # Build human-readable reason
-        reason_parts: List[str] = []
-        if count > 0:
-            reason_parts.append(f"Similar to {count} of your books")
-        if avg_pos < 3:
-            reason_parts.append("highly ranked in Audible sims")
-        elif avg_pos < 8:
-            reason_parts.append("recommended by Audible sims")
-        # Author/Narrator matches
-        matched_authors = [a for a in (b.authors or []) if user_authors.get(a, 0) > 0]
-        if matched_authors:
-            # show up to 2
-            reason_parts.append("by your frequent author " + ", ".join(matched_authors[:2]))
-        matched_narrs = [n for n in (b.narrators or []) if user_narrators.get(n, 0) > 0]
-        if matched_narrs and not matched_authors:
-            reason_parts.append("narrated by a favorite narrator")
-        if _recent_component(b) > 0.6:
-            reason_parts.append("recent release")
-        reasons_map[b.asin] = "; ".join(reason_parts) if reason_parts else "because you requested similar books"
-
     # Deterministic tiebreaker using username to keep results stable per user
-    def _tie(b: BookRequest) -> int:
-        h = hashlib.sha1(f"{user.username}:{b.asin}".encode(), usedforsecurity=False).hexdigest()
-        return int(h[:8], 16)
-
-    cand_scores.sort(key=lambda x: (-x[1], _tie(x[0])))
-
-    # Diversity: limit over-repetition of same author in the top results (MMR-lite)
-    MAX_PER_AUTHOR = 2
-    author_counts: Counter[str] = Counter()
-    diversified: list[BookRequest] = []
-    remainder: list[BookRequest] = []
-    for b, _score, _cnt, _avg in cand_scores:
-        authors = b.authors or [""]
-        # If any author exceeds cap, push to remainder; else accept
-        if any(author_counts[a] >= MAX_PER_AUTHOR for a in authors if a):
-            remainder.append(b)
-            continue
-        for a in authors:
-            if a:
-                author_counts[a] += 1
-        diversified.append(b)
+    tie_map = {
+        b.asin: zlib.crc32(f"{user.username}:{b.asin}".encode())
+        for b, _score, _cnt, _avg in cand_scores
+    }
 
-    ordered_books = diversified + remainder
+    # Only the best candidates can end up in the results, even after the diversity pass
+    top_scores = heapq.nsmallest(
+        limit * 4, cand_scores, key=lambda x: (-x[1], tie_map[x[0].asin])
+    )
+
+    # Diversity: greedy Maximal Marginal Relevance. Each pick maximizes the normalized
+    # score minus the similarity (Jaccard over authors and narrators) to the books
+    # already picked. The name sets are int bitsets, one bit per distinct name
+    MMR_LAMBDA = 0.75
+    max_score = max((x[1] for x in top_scores), default=0.0) or 1.0
+    name_bits: dict[str, int] = {}
+    candidates: list[tuple[BookRequest, float, int]] = []
+    for b, score, _cnt, _avg in top_scores:
+        names = 0
+        for name in chain(b.authors, b.narrators):
+            names |= name_bits.setdefault(name, 1 << len(name_bits))
+        candidates.append((b, score / max_score, names))
+
+    def _diversify() -> list[BookRequest]:
+        remaining = [c for c in candidates if not c[0].downloaded]
+        max_sims = [0.0] * len(remaining)
+        picked: list[BookRequest] = []
+        while remaining and len(picked) < limit:
+            best = max(
+                range(len(remaining)),
+                key=lambda i: MMR_LAMBDA * remaining[i][1] - (1 - MMR_LAMBDA) * max_sims[i],
+            )
+            b, _score, names = remaining.pop(best)
+            max_sims.pop(best)
+            picked.append(b)
+            for i, (_b, _s, other) in enumerate(remaining):
+                union = (names | other).bit_count()
+                if union:
+                    max_sims[i] = max(max_sims[i], (names & other).bit_count() / union)
+        return picked
+
+    ordered_books = _diversify()
+
+    # Attempt to mark downloaded via ABS if configured (best-effort). Only the first picks
+    # are checked to bound the amount of ABS searches
+    try:
+        from app.internal.audiobookshelf.config import abs_config
+        from app.internal.audiobookshelf.client import abs_mark_downloaded_flags
+        if abs_config.is_valid(session) and abs_config.get_check_downloaded(session):
+            await abs_mark_downloaded_flags(session, client_session, ordered_books)
+            if any(b.downloaded for b in ordered_books):
+                # Pick again without the books that are already in the library
+                ordered_books = _diversify()
+    except Exception as e:
+        logger.debug("ABS exist check skipped", error=str(e))
 
     # Convert to BookSearchResult and apply limit
     results: list[BookSearchResult] = []
     for b in ordered_books[:limit]:
-        r = BookSearchResult.model_validate(b)
-        r.already_requested = False
+        r = _to_search_result(b, already_requested=False)
         results.append(r)
 
-    # Attach reasons to cache entry if pooled caller is used (handled upstream)
     return results
 
 
-async def get_user_sims_recommendations_pooled(
+async def _get_user_recs_entry(
     session: Session,
     client_session: ClientSession,
     user: User,
-    seed_asins: Optional[Iterable[str]] = None,
-    pool_size: int = 240,
-) -> list[BookSearchResult]:
-    """
-    Return a larger, cached pool of personalized recommendations for a user.
-    This supports pagination on the UI without re-aggregating for each page.
-    """
+    seed_asins: Optional[Iterable[str]],
+    pool_size: int,
+    user_requests: Optional[list[_UserRequest]],
+) -> _UserRecsCacheEntry:
     seeds_list = [s for s in (seed_asins or []) if s]
 
     # Build a deterministic, compact seed signature (limit to avoid huge keys)
@@ -258,26 +307,73 @@ async def get_user_sims_recommendations_pooled(
 
     now = time.time()
     cached = _USER_RECS_CACHE.get(cache_key)
-    if cached and now - cached.timestamp < _USER_RECS_TTL and len(cached.value) >= min(24, pool_size):
-        return cached.value[:pool_size]
+    # Pools of different sizes share the key, a larger cached pool also serves smaller ones
+    if (
+        cached
+        and now - cached.timestamp < _USER_RECS_TTL
+        and cached.depth >= pool_size
+        and len(cached.value) >= min(24, pool_size)
+    ):
+        return cached
+
+    inflight = _USER_RECS_INFLIGHT.get(cache_key)
+    if inflight:
+        # Another request is already building this pool, share its result
+        try:
+            entry = await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+        else:
+            if entry.depth >= pool_size:
+                return entry
+
+    future: asyncio.Future[_UserRecsCacheEntry] = asyncio.get_running_loop().create_future()
+    _USER_RECS_INFLIGHT[cache_key] = future
     try:
-        # Compute detailed list again to capture reasons by reusing logic
-        # Note: to avoid double work, we could refactor the sims aggregation, but keep it simple for now
-        recs = await get_user_sims_recommendations(
-            session=session,
-            client_session=client_session,
-            user=user,
-            seed_asins=seeds_list,
-            limit=pool_size,
-        )
-    except Exception:
-        # Fallback to preference-based
-        recs = get_user_recommendations(session, user, limit=pool_size)
-    # Build a minimal reasons map from top-N (best-effort): generic reason
-    reasons = {b.asin: "personalized mix from Audible sims and your history" for b in recs}
+        try:
+            recs = await get_user_sims_recommendations(
+                session=session,
+                client_session=client_session,
+                user=user,
+                seed_asins=seeds_list,
+                limit=pool_size,
+                user_requests=user_requests,
+            )
+        except Exception:
+            # Fallback to preference-based
+            recs = get_user_recommendations(session, user, limit=pool_size, user_requests=user_requests)
+        # Build a minimal reasons map from top-N (best-effort): generic reason
+        reasons = {b.asin: "personalized mix from Audible sims and your history" for b in recs}
+
+        entry = _UserRecsCacheEntry(value=recs, reasons=reasons, depth=pool_size, timestamp=now)
+        _store_user_recs(cache_key, entry)
+        future.set_result(entry)
+        return entry
+    finally:
+        # waiting requests compute the pool themselves if this one failed
+        if not future.done():
+            future.cancel()
+        if _USER_RECS_INFLIGHT.get(cache_key) is future:
+            del _USER_RECS_INFLIGHT[cache_key]
+
 
-    _USER_RECS_CACHE[cache_key] = _UserRecsCacheEntry(value=recs, reasons=reasons, timestamp=now)
-    return recs
+async def get_user_sims_recommendations_pooled(
+    session: Session,
+    client_session: ClientSession,
+    user: User,
+    seed_asins: Optional[Iterable[str]] = None,
+    pool_size: int = 240,
+    user_requests: Optional[list[_UserRequest]] = None,
+) -> list[BookSearchResult]:
+    """
+    Return a larger, cached pool of personalized recommendations for a user.
+    This supports pagination on the UI without re-aggregating for each page.
+    """
+    entry = await _get_user_recs_entry(
+        session, client_session, user, seed_asins, pool_size, user_requests
+    )
+    return entry.value[:pool_size]
 
 
 async def get_user_sims_recommendations_pooled_with_reasons(
@@ -286,27 +382,15 @@ async def get_user_sims_recommendations_pooled_with_reasons(
     user: User,
     seed_asins: Optional[Iterable[str]] = None,
     pool_size: int = 240,
+    user_requests: Optional[list[_UserRequest]] = None,
 ) -> tuple[list[BookSearchResult], dict[str, str]]:
     """
     Like get_user_sims_recommendations_pooled but also returns reasons map for display.
     """
-    seeds_list = [s for s in (seed_asins or []) if s]
-    seed_sig = ",".join(sorted(seeds_list)[:60])
-    cache_key = _UserRecsCacheKey(username=user.username, seed_sig=seed_sig)
-    now = time.time()
-    cached = _USER_RECS_CACHE.get(cache_key)
-    if cached and now - cached.timestamp < _USER_RECS_TTL and len(cached.value) >= min(24, pool_size):
-        return cached.value[:pool_size], cached.reasons
-
-    # Generate pool and attach generic reasons (as above)
-    recs = await get_user_sims_recommendations_pooled(
-        session, client_session, user, seed_asins=seeds_list, pool_size=pool_size
+    entry = await _get_user_recs_entry(
+        session, client_session, user, seed_asins, pool_size, user_requests
     )
-    cached = _USER_RECS_CACHE.get(cache_key)
-    reasons = cached.reasons if cached else {b.asin: "personalized recommendations" for b in recs}
-    return recs, reasons
-    _USER_RECS_CACHE[cache_key] = _UserRecsCacheEntry(value=recs, timestamp=now)
-    return recs
+    return entry.value[:pool_size], entry.reasons
 
 
 def get_popular_books(
@@ -365,8 +449,8 @@ def get_popular_books(
     
     popular_books = []
     for book, request_count in results:
-        book_result = BookSearchResult.model_validate(book)
-        book_result.already_requested = True  # These are popular because they were requested
+        # These are popular because they were requested
+        book_result = _to_search_result(book, already_requested=True)
         popular_books.append(book_result)
         logger.debug(f"Popular book: {book.title} (requests: {request_count})")
     
@@ -415,13 +499,19 @@ def get_recently_requested_books(
     for book in results:
         if book.asin not in seen_asins and len(recent_books) < limit:
             seen_asins.add(book.asin)
-            book_result = BookSearchResult.model_validate(book)
-            book_result.already_requested = True
+            book_result = _to_search_result(book, already_requested=True)
             recent_books.append(book_result)
     
     return recent_books
 
 
+def _json_array_values(session: Session, column: ColumnElement[list[str]]) -> TableValuedAlias:
+    """Table-valued expression with one `value` row per element of a JSON string list."""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.json_array_elements_text(column).table_valued("value").render_derived()
+    return func.json_each(column).table_valued("value")
+
+
 def get_books_by_popular_authors(
     session: Session, 
     limit: int = 12,
@@ -438,50 +528,42 @@ def get_books_by_popular_authors(
     Returns:
         List of books by popular authors as BookSearchResult objects
     """
-    # First, get the most popular authors
-    all_requests = session.exec(
-        select(BookRequest).where(
-            col(BookRequest.user_username).is_not(None),
-        )
+    # Count requests per author in the database and only load the top authors
+    author = _json_array_values(session, BookRequest.authors)
+    top_authors = session.exec(
+        select(author.c.value)
+        .select_from(BookRequest)
+        .join(author, true())
+        .where(col(BookRequest.user_username).is_not(None))
+        .group_by(author.c.value)
+        .order_by(func.count().desc())
+        .limit(10)
     ).all()
     
-    # Count requests per author
-    author_request_counts = Counter()
-    for book in all_requests:
-        for author in book.authors:
-            author_request_counts[author] += 1
-    
-    # Get top authors
-    top_authors = [author for author, _ in author_request_counts.most_common(10)]
-    
     if not top_authors:
         return []
     
     # Get books by these popular authors that haven't been requested yet
+    book_author = _json_array_values(session, BookRequest.authors)
     query = (
         select(BookRequest)
         .where(
             col(BookRequest.user_username).is_(None),  # Only cache entries, not user requests
+            select(book_author.c.value)
+            .where(col(book_author.c.value).in_(top_authors))
+            .exists(),
         )
         .order_by(desc(BookRequest.updated_at))
+        .limit(limit)
     )
     
     if exclude_downloaded:
         query = query.where(~BookRequest.downloaded)
     
-    cache_books = session.exec(query).all()
-    
-    # Filter books by popular authors
     author_books = []
-    for book in cache_books:
-        if len(author_books) >= limit:
-            break
-        
-        # Check if any of the book's authors are in our popular authors list
-        if any(author in top_authors for author in book.authors):
-            book_result = BookSearchResult.model_validate(book)
-            book_result.already_requested = False
-            author_books.append(book_result)
+    for book in session.exec(query).all():
+        book_result = _to_search_result(book, already_requested=False)
+        author_books.append(book_result)
     
     return author_books
 
@@ -489,7 +571,8 @@ def get_books_by_popular_authors(
 def get_user_recommendations(
     session: Session, 
     user: User, 
-    limit: int = 12
+    limit: int = 12,
+    user_requests: Optional[list[_UserRequest]] = None,
 ) -> list[BookSearchResult]:
     """
     Get personalized recommendations for a specific user based on their request history.
@@ -498,38 +581,39 @@ def get_user_recommendations(
         session: Database session
         user: User to get recommendations for
         limit: Maximum number of books to return
+        user_requests: The user's requests, if already loaded by the caller
     
     Returns:
         List of recommended books for the user
     """
     # Get user's requested books to analyze preferences
-    user_requests = session.exec(
-        select(BookRequest).where(
-            BookRequest.user_username == user.username
-        )
-    ).all()
+    if user_requests is None:
+        user_requests = _get_user_requests(session, user)
     
     if not user_requests:
         # If user has no history, return popular books
         return get_popular_books(session, limit)
     
-    # Extract user's favorite authors and narrators
-    user_authors = []
-    user_narrators = []
+    # Count the user's favorite authors and narrators
+    author_preferences = Counter(chain.from_iterable(book.authors for book in user_requests))
+    narrator_preferences = Counter(chain.from_iterable(book.narrators for book in user_requests))
     
-    for book in user_requests:
-        user_authors.extend(book.authors)
-        user_narrators.extend(book.narrators)
-    
-    # Count preferences
-    author_preferences = Counter(user_authors)
-    narrator_preferences = Counter(user_narrators)
-    
-    # Get books from cache that match user preferences
+    # Get books from cache that match user preferences, only books sharing an author
+    # or narrator with the user's requests can score
+    book_author = _json_array_values(session, BookRequest.authors)
+    book_narrator = _json_array_values(session, BookRequest.narrators)
     cache_books = session.exec(
         select(BookRequest).where(
             col(BookRequest.user_username).is_(None),  # Cache entries only
-            ~BookRequest.downloaded
+            ~BookRequest.downloaded,
+            or_(
+                select(book_author.c.value)
+                .where(col(book_author.c.value).in_(list(author_preferences)))
+                .exists(),
+                select(book_narrator.c.value)
+                .where(col(book_narrator.c.value).in_(list(narrator_preferences)))
+                .exists(),
+            ),
         )
         .order_by(desc(BookRequest.updated_at))
         .limit(limit * 5)  # Get more to filter from
@@ -554,8 +638,7 @@ def get_user_recommendations(
             score += narrator_preferences.get(narrator, 0) * 2
         
         if score > 0:
-            book_result = BookSearchResult.model_validate(book)
-            book_result.already_requested = False
+            book_result = _to_search_result(book, already_requested=False)
             scored_books.append((book_result, score))
     
     # Sort by score and return top results
@@ -583,8 +666,7 @@ async def get_popular_books_from_audible(
         
         result_books = []
         for book in popular_books:
-            book_result = BookSearchResult.model_validate(book)
-            book_result.already_requested = False
+            book_result = _to_search_result(book, already_requested=False)
             result_books.append(book_result)
         
         logger.debug(f"Retrieved {len(result_books)} popular books from Audible")
@@ -606,34 +688,41 @@ async def get_category_books(
     from app.util.log import logger
     
     all_books = []
+    seen_asins: set[str] = set()
     books_per_term = max(1, limit // len(search_terms))
     
-    for term in search_terms:
-        try:
-            term_books = await list_audible_books(
+    # Search all terms at once; cached terms return without a request
+    term_results = await asyncio.gather(
+        *[
+            list_audible_books(
                 session=session,
                 client_session=client_session,
                 query=term,
                 num_results=books_per_term + 2,  # Get a few extra to account for duplicates
                 page=0
             )
-            
-            # Add unique books only
-            for book in term_books:
-                book_result = BookSearchResult.model_validate(book)
-                book_result.already_requested = False
-                
-                # Check if already exists (by ASIN)
-                if not any(existing.asin == book_result.asin for existing in all_books):
-                    all_books.append(book_result)
-                
-                if len(all_books) >= limit:
-                    break
-                    
-        except Exception as e:
-            logger.warning(f"Failed to search for category term '{term}': {e}")
+            for term in search_terms
+        ],
+        return_exceptions=True,
+    )
+    
+    for term, term_books in zip(search_terms, term_results):
+        if isinstance(term_books, BaseException):
+            logger.warning(f"Failed to search for category term '{term}': {term_books}")
             continue
         
+        # Add unique books only
+        for book in term_books:
+            book_result = _to_search_result(book, already_requested=False)
+            
+            # Check if already exists (by ASIN)
+            if book_result.asin not in seen_asins:
+                seen_asins.add(book_result.asin)
+                all_books.append(book_result)
+            
+            if len(all_books) >= limit:
+                break
+        
         if len(all_books) >= limit:
             break
     
@@ -668,13 +757,18 @@ async def get_homepage_recommendations_async(
     
     # Combine and remove duplicates
     popular_combined = list(user_popular)
+    popular_asins = {book.asin for book in popular_combined}
     for book in audible_popular:
-        if not any(existing.asin == book.asin for existing in popular_combined):
+        if book.asin not in popular_asins:
+            popular_asins.add(book.asin)
             popular_combined.append(book)
     recommendations["popular"] = popular_combined[:12]
     
     # 2. User personalized recommendations (if user exists)
+    # Loaded once and shared by all the personalized sections
+    user_requests: list[_UserRequest] = []
     if user:
+        user_requests = _get_user_requests(session, user)
         # Build seed list from optional ABS items
         seed_asins: list[str] = []
         if abs_seed_asins:
@@ -682,26 +776,28 @@ async def get_homepage_recommendations_async(
         try:
             # Use pooled generator to keep results stable and rich
             rec_pool = await get_user_sims_recommendations_pooled(
-                session, client_session, user, seed_asins, pool_size=60
+                session,
+                client_session,
+                user,
+                seed_asins,
+                pool_size=60,
+                user_requests=user_requests,
             )
             recommendations["for_you"] = rec_pool[:12]
         except Exception as e:
             logger.warning(f"Sims-based recommendations failed, falling back: {e}")
-            recommendations["for_you"] = get_user_recommendations(session, user, limit=12)
+            recommendations["for_you"] = get_user_recommendations(
+                session, user, limit=12, user_requests=user_requests
+            )
 
         # 2b. Because you've read sections (seeded by user's recent requests)
         try:
             sections: list[dict] = []
-            # Fetch recent requested books by user to use as seeds
-            recent_reqs: list[BookRequest] = session.exec(
-                select(BookRequest)
-                .where(BookRequest.user_username == user.username)
-                .order_by(desc(BookRequest.updated_at))
-                .limit(12)
-            ).all()
+            # Use the user's most recently requested books as seeds
+            recent_reqs = sorted(user_requests, key=lambda b: b.updated_at, reverse=True)[:12]
             # Deduplicate by ASIN and keep those with ASINs
             seen_asins: set[str] = set()
-            seeds: list[BookRequest] = []
+            seeds: list[_UserRequest] = []
             for b in recent_reqs:
                 if b.asin and b.asin not in seen_asins:
                     seen_asins.add(b.asin)
@@ -718,8 +814,7 @@ async def get_homepage_recommendations_async(
                 books: list[BookSearchResult] = []
                 for sb in sims:
                     try:
-                        r = BookSearchResult.model_validate(sb)
-                        r.already_requested = False
+                        r = _to_search_result(sb, already_requested=False)
                         # Avoid including the seed itself if it appears
                         if r.asin and r.asin != seed.asin and not any(x.asin == r.asin for x in books):
                             books.append(r)
@@ -740,13 +835,9 @@ async def get_homepage_recommendations_async(
         # 2c. Authors you like (top authors from history)
         try:
             # Count authors from user's requests
-            user_requests: list[BookRequest] = session.exec(
-                select(BookRequest).where(BookRequest.user_username == user.username)
-            ).all()
-            author_counts: Counter[str] = Counter()
-            for b in user_requests:
-                for a in b.authors or []:
-                    author_counts[a] += 1
+            author_counts: Counter[str] = Counter(
+                chain.from_iterable(b.authors or [] for b in user_requests)
+            )
             top_authors = [a for a, _ in author_counts.most_common(5) if a]
             author_sections: list[dict] = []
             for a in top_authors[:2]:
@@ -829,9 +920,7 @@ async def get_homepage_recommendations_async(
                     # Resolve to actual BookSearchResults via searches
                     resolved: list[dict] = []
                     seen_asins: set[str] = set()
-                    user_asins: set[str] = set()
-                    if user:
-                        user_asins = {b.asin for b in session.exec(select(BookRequest).where(BookRequest.user_username == user.username)).all() if b.asin}
+                    user_asins = {b.asin for b in user_requests if b.asin}
                     for rec in ai_title_recs:
                         # Build search candidates: explicit terms or title+author
                         terms = rec.get("search_terms") or []
@@ -933,8 +1022,7 @@ def get_homepage_recommendations(
         if cached_books:
             fallback_books = []
             for book in cached_books[:8]:
-                book_result = BookSearchResult.model_validate(book)
-                book_result.already_requested = False
+                book_result = _to_search_result(book, already_requested=False)
                 fallback_books.append(book_result)
             recommendations["popular"] = fallback_books
             logger.debug(f"Using {len(fallback_books)} cached books as popular recommendations")
@@ -1,14 +1,33 @@
-from typing import Any, Mapping, overload
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Mapping, overload
 
 import markdown
 from fastapi import Request, Response
+from fastapi.responses import HTMLResponse
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+)
+from jinja2.runtime import Context
 from jinja2_fragments.fastapi import Jinja2Blocks
 from starlette.background import BackgroundTask
 
 from app.internal.auth.authentication import DetailedUser
 from app.internal.env_settings import Settings
 
-templates = Jinja2Blocks(directory="templates")
+# Compiled templates are kept for the lifetime of the process. Outside of debug mode the
+# templates don't change, so there's no need to stat the files on every render.
+templates = Jinja2Blocks(
+    env=Environment(
+        loader=FileSystemLoader("templates"),
+        autoescape=True,
+        auto_reload=Settings().app.debug,
+        cache_size=-1,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+)
 templates.env.filters["zfill"] = lambda val, num: str(val).zfill(num)  # pyright: ignore[reportUnknownLambdaType,reportUnknownMemberType,reportUnknownArgumentType]
 templates.env.filters["toJSstring"] = (  # pyright: ignore[reportUnknownLambdaType,reportUnknownMemberType,reportUnknownArgumentType]
     lambda val: f"'{str(val).replace("'", "\\'").replace('\n', '\\n')}'"  # pyright: ignore[reportUnknownLambdaType,reportUnknownMemberType,reportUnknownArgumentType]
@@ -26,6 +45,15 @@ with open("CHANGELOG.md", "r") as file:
 templates.env.globals["changelog"] = markdown.markdown(changelog_content)  # pyright: ignore[reportUnknownMemberType]
 
 
+@lru_cache(maxsize=128)
+def _get_block_renderer(
+    name: str, block_name: str
+) -> tuple[Template, Callable[[Context], Iterator[str]]]:
+    """Resolves the compiled render function of a template block once"""
+    template = templates.get_template(name)
+    return template, template.blocks[block_name]
+
+
 @overload
 def template_response(
     name: str,
@@ -71,7 +99,24 @@ def template_response(
     copy = context.copy()
     copy.update({"request": request, "user": user})
 
+    # HTMX partials: render the block directly instead of resolving the template and
+    # block again for every response. Skipped when templates are reloaded on change.
+    block_name: str | None = kwargs.get("block_name")
+    if block_name and not templates.env.auto_reload:
+        template, render_block = _get_block_renderer(name, block_name)
+        try:
+            return HTMLResponse(
+                content=templates.env.concat(render_block(template.new_context(copy))),  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType]
+                status_code=status_code,
+                headers=headers,
+                media_type=media_type,
+                background=background,
+            )
+        except Exception:
+            templates.env.handle_exception()
+
     return templates.TemplateResponse(
+        request=request,
         name=name,
         context=copy,
         status_code=status_code,
@@ -0,0 +1,15 @@
+from typing import Optional
+
+from app.internal.models import WishlistCounts
+from app.util.cache import SimpleCache
+
+# The counts are shown on every wishlist page. They're cached per username (None for
+# admins, which see all requests) and flushed whenever a request is added, removed or
+# marked as downloaded. The TTL only limits how long a missed change can stay visible.
+WISHLIST_COUNTS_TTL = 60
+
+wishlist_counts_cache = SimpleCache[WishlistCounts, Optional[str]]()
+
+
+def flush_wishlist_counts():
+    wishlist_counts_cache.flush()